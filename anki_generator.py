@@ -5,11 +5,80 @@ Generates a main deck with subdecks for each lesson
 """
 
 import genanki
+import functools
+import hashlib
+import itertools
+import json
+import logging
 import os
 import re
-from typing import List, Dict
+import sqlite3
+import tempfile
+import time
+import zipfile
+from typing import List, Dict, Optional, Tuple
 from pdf_parser import VocabularyCard
 
+# Precompiled patterns for lesson filename parsing
+_LESSON_RE = re.compile(r'第(\d+(?:\.\d+)?)课')
+_CLEAN_RE = re.compile(r'[^\w\s-]')
+_STRIP_RE = re.compile(r'\.pdf$|零基础学英语|-星荣英语笔记')
+
+# Tags shared by every note, after the per-lesson tag
+_COMMON_TAGS = ("Xingrong", "English", "Vocabulary")
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _deck_id(key: str) -> int:
+    """
+    Stable deck ID derived from a key string
+    Unlike hash(), the result does not change between runs (PYTHONHASHSEED),
+    so re-imported decks keep their IDs in Anki
+    """
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % (10 ** 10)
+
+
+class _BufferedPackage(genanki.Package):
+    """
+    genanki.Package that writes the collection database without per-statement syncing
+    The temporary sqlite file is thrown away once zipped, so durability is not needed
+    """
+    
+    def write_to_file(self, file, timestamp: Optional[float] = None):
+        dbfile, dbfilename = tempfile.mkstemp()
+        os.close(dbfile)
+        
+        try:
+            conn = sqlite3.connect(dbfilename)
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("PRAGMA journal_mode=MEMORY")
+            cursor = conn.cursor()
+            
+            if timestamp is None:
+                timestamp = time.time()
+            
+            id_gen = itertools.count(int(timestamp * 1000))
+            self.write_to_db(cursor, timestamp, id_gen)
+            
+            conn.commit()
+            conn.close()
+            
+            # Stored, not deflated (same as genanki): zipping stays a plain copy
+            with zipfile.ZipFile(file, 'w', zipfile.ZIP_STORED) as outzip:
+                outzip.write(dbfilename, 'collection.anki2')
+                
+                media_file_idx_to_path = dict(enumerate(self.media_files))
+                media_json = {idx: os.path.basename(path) for idx, path in media_file_idx_to_path.items()}
+                outzip.writestr('media', json.dumps(media_json))
+                
+                for idx, path in media_file_idx_to_path.items():
+                    outzip.write(path, str(idx))
+        finally:
+            os.remove(dbfilename)
+
 class XingrongAnkiGenerator:
     """Generator for Anki decks from Xingrong vocabulary cards"""
     
@@ -46,7 +115,9 @@ class XingrongAnkiGenerator:
             '''
         )
     
-    def create_deck_name(self, pdf_filename: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def create_deck_name(pdf_filename: str) -> str:
         """
         Create a deck name from PDF filename, keeping the original format
         """
@@ -56,7 +127,9 @@ class XingrongAnkiGenerator:
         # Keep the original name as is, no prefix or character removal
         return name
     
-    def extract_lesson_number(self, pdf_filename: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def extract_lesson_number(pdf_filename: str) -> str:
         """
         Extract lesson number from PDF filename for tagging
         """
@@ -64,39 +137,35 @@ class XingrongAnkiGenerator:
         name = pdf_filename.replace('.pdf', '')
         
         # Extract lesson number using regex
-        lesson_match = re.search(r'第(\d+(?:\.\d+)?)课', name)
+        lesson_match = _LESSON_RE.search(name)
         if lesson_match:
             return f"Lesson_{lesson_match.group(1).replace('.', '_')}"
         
         # Fallback: use the whole filename
-        return re.sub(r'[^\w\s-]', '', name).replace(' ', '_')
+        return _CLEAN_RE.sub('', name).replace(' ', '_')
     
     def deduplicate_cards(self, pdf_cards: Dict[str, List[VocabularyCard]]) -> Dict[str, List[VocabularyCard]]:
         """
         Remove duplicate cards based on Chinese text, keeping the first occurrence
         """
         seen_chinese = set()
+        seen_add = seen_chinese.add  # set.add returns None, so it can sit inside the filter
         deduplicated_pdf_cards = {}
-        
-        print("Deduplicating cards...")
-        
+
+        logger.info("Deduplicating cards...")
+
         for pdf_filename, cards in pdf_cards.items():
             if not cards:
                 deduplicated_pdf_cards[pdf_filename] = []
                 continue
-            
-            unique_cards = []
-            duplicates_count = 0
-            
-            for card in cards:
-                if card.chinese not in seen_chinese:
-                    seen_chinese.add(card.chinese)
-                    unique_cards.append(card)
-                else:
-                    duplicates_count += 1
-            
+
+            unique_cards = [card for card in cards
+                            if card.chinese not in seen_chinese and not seen_add(card.chinese)]
+            duplicates_count = len(cards) - len(unique_cards)
+
             if duplicates_count > 0:
-                print(f"  {pdf_filename}: {len(cards)} -> {len(unique_cards)} cards (removed {duplicates_count} duplicates)")
+                logger.info("  %s: %d -> %d cards (removed %d duplicates)",
+                            pdf_filename, len(cards), len(unique_cards), duplicates_count)
             
             deduplicated_pdf_cards[pdf_filename] = unique_cards
         
@@ -109,7 +178,7 @@ class XingrongAnkiGenerator:
         # First deduplicate cards
         deduplicated_cards = self.deduplicate_cards(pdf_cards)
         
-        deck_id = abs(hash("Xingrong_Unified_Deck")) % (10 ** 10)  # Generate unique deck ID
+        deck_id = _deck_id("Xingrong_Unified_Deck")  # Generate stable deck ID
         deck = genanki.Deck(deck_id, deck_name)
         
         total_cards = 0
@@ -118,9 +187,14 @@ class XingrongAnkiGenerator:
                 continue
             
             lesson_tag = self.extract_lesson_number(pdf_filename)
-            lesson_name = pdf_filename.replace('.pdf', '').replace('零基础学英语', '').replace('-星荣英语笔记', '')
+            lesson_name = _STRIP_RE.sub('', pdf_filename)
+            
+            logger.info("Adding %d cards from %s with tag: %s", len(cards), lesson_name, lesson_tag)
             
-            print(f"Adding {len(cards)} cards from {lesson_name} with tag: {lesson_tag}")
+            # Per-lesson values are the same for every card, build them once
+            lesson_tags = [lesson_tag, *_COMMON_TAGS]
+            tag_field = f"{lesson_tag} {lesson_name}"
+            add_note = deck.add_note
             
             for card in cards:
                 # Create note with vocabulary data and tags
@@ -130,14 +204,14 @@ class XingrongAnkiGenerator:
                         card.chinese, 
                         card.english, 
                         card.phonetic or '', 
-                        f"{lesson_tag} {lesson_name}"
+                        tag_field
                     ],
-                    tags=[lesson_tag, "Xingrong", "English", "Vocabulary"]
+                    tags=lesson_tags
                 )
-                deck.add_note(note)
+                add_note(note)
                 total_cards += 1
         
-        print(f"Created unified deck with {total_cards} total unique cards")
+        logger.info("Created unified deck with %d total unique cards", total_cards)
         return deck
     
     def create_main_deck_with_subdecks(self, pdf_cards: Dict[str, List[VocabularyCard]], main_deck_name: str = "星荣英语") -> List[genanki.Deck]:
@@ -145,56 +219,38 @@ class XingrongAnkiGenerator:
         Create a main deck with subdecks for each lesson
         Returns a list of decks: [main_deck, subdeck1, subdeck2, ...]
         """
-        print(f"Creating main deck with subdecks...")
+        logger.info("Creating main deck with subdecks...")
         
         # First deduplicate cards
         deduplicated_cards = self.deduplicate_cards(pdf_cards)
         
-        # Create main deck
-        main_deck_id = abs(hash("Xingrong_Main_Deck")) % (10 ** 10)
+        # Create main deck (kept empty as the root of the subdeck hierarchy)
+        main_deck_id = _deck_id("Xingrong_Main_Deck")
         main_deck = genanki.Deck(main_deck_id, main_deck_name)
         
         # Create subdecks for each lesson
         all_decks = [main_deck]
         total_cards = 0
         
-        # Sort lessons by lesson number for proper ordering
-        def extract_lesson_number_for_sort(pdf_filename: str) -> float:
-            """Extract lesson number for sorting"""
-            import re
-            match = re.search(r'第(\d+(?:\.\d+)?)课', pdf_filename)
-            if match:
-                return float(match.group(1))
-            return 999  # Put unmatched items at the end
-        
-        # Sort the lessons by lesson number
-        sorted_lessons = sorted(deduplicated_cards.items(), key=lambda x: extract_lesson_number_for_sort(x[0]))
+        # Parse every lesson filename once up front, then sort by lesson number
+        entries = [(pdf_filename, cards, *self._parse_lesson(pdf_filename))
+                   for pdf_filename, cards in deduplicated_cards.items() if cards]
+        entries.sort(key=lambda entry: entry[5])
         
-        for pdf_filename, cards in sorted_lessons:
-            if not cards:
-                continue
-            
-            # Extract lesson info
-            lesson_tag = self.extract_lesson_number(pdf_filename)
-            lesson_name = self.extract_clean_lesson_name(pdf_filename)
-            
-            # Extract lesson number for proper sorting
-            import re
-            lesson_match = re.search(r'第(\d+(?:\.\d+)?)课', lesson_name)
-            if lesson_match:
-                lesson_num = float(lesson_match.group(1))
-                # Format with leading zeros for proper sorting: "01" "02" "10.5" etc
-                if lesson_num == int(lesson_num):
-                    formatted_num = f"{int(lesson_num):02d}"
-                else:
-                    formatted_num = f"{lesson_num:04.1f}".replace('.', '_')
+        for pdf_filename, cards, lesson_tag, lesson_name, formatted_num, lesson_num in entries:
+            if formatted_num is not None:
                 subdeck_name = f"{main_deck_name}::{formatted_num}_{lesson_name}"
             else:
                 subdeck_name = f"{main_deck_name}::{lesson_name}"
-            subdeck_id = abs(hash(f"Xingrong_Subdeck_{lesson_tag}")) % (10 ** 10)
+            subdeck_id = _deck_id(f"Xingrong_Subdeck_{lesson_tag}")
             subdeck = genanki.Deck(subdeck_id, subdeck_name)
             
-            print(f"Creating subdeck: {subdeck_name} with {len(cards)} cards")
+            logger.info("Creating subdeck: %s with %d cards", subdeck_name, len(cards))
+            
+            # Per-lesson values are the same for every card, build them once
+            lesson_tags = [lesson_tag, *_COMMON_TAGS]
+            tag_field = f"{lesson_tag} {lesson_name}"
+            sub_add = subdeck.add_note
             
             for card in cards:
                 # Create note with vocabulary data
@@ -204,43 +260,62 @@ class XingrongAnkiGenerator:
                         card.chinese, 
                         card.english, 
                         card.phonetic or '', 
-                        f"{lesson_tag} {lesson_name}"
+                        tag_field
                     ],
-                    tags=[lesson_tag, "Xingrong", "English", "Vocabulary"]
+                    tags=lesson_tags
                 )
                 
-                # Add note to both main deck and subdeck
-                main_deck.add_note(note)
-                subdeck.add_note(note)
+                # Add note to the subdeck only; Anki shows the main deck
+                # as the union of its "::" subdecks
+                sub_add(note)
                 total_cards += 1
             
             all_decks.append(subdeck)
         
-        print(f"Created main deck with {total_cards} cards and {len(all_decks)-1} subdecks")
+        logger.info("Created main deck with %d cards and %d subdecks", total_cards, len(all_decks) - 1)
         return all_decks
     
-    def extract_clean_lesson_name(self, pdf_filename: str) -> str:
+    def _parse_lesson(self, pdf_filename: str) -> Tuple[str, str, Optional[str], float]:
         """
-        Extract clean lesson name for subdeck naming
+        Parse lesson info from PDF filename for subdeck creation
+        Returns (lesson_tag, lesson_name, formatted_num, lesson_num), where
+        formatted_num is None and lesson_num is 999 when no lesson number is found
         """
-        # Remove .pdf extension
-        name = pdf_filename.replace('.pdf', '')
+        lesson_tag = self.extract_lesson_number(pdf_filename)
+        lesson_name = self.extract_clean_lesson_name(pdf_filename)
+        
+        lesson_match = _LESSON_RE.search(lesson_name)
+        if not lesson_match:
+            return lesson_tag, lesson_name, None, 999  # Put unmatched items at the end
         
+        lesson_num = float(lesson_match.group(1))
+        # Format with leading zeros for proper sorting: "01" "02" "10_5" etc
+        # Round to tenths once (as "%.1f" does) and split, so a carry moves into the whole part
+        whole, frac10 = divmod(round(round(lesson_num, 1) * 10), 10)
+        formatted_num = f"{whole:02d}" if lesson_num.is_integer() else f"{whole:02d}_{frac10}"
+        return lesson_tag, lesson_name, formatted_num, lesson_num
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def extract_clean_lesson_name(pdf_filename: str) -> str:
+        """
+        Extract clean lesson name for subdeck naming
+        """
         # Extract just the lesson part: "第X课" or "第X.Y课"
-        lesson_match = re.search(r'(第\d+(?:\.\d+)?课)', name)
+        lesson_match = _LESSON_RE.search(pdf_filename)
         if lesson_match:
-            return lesson_match.group(1)
+            return lesson_match.group(0)
         
-        # Fallback: clean up the name
-        clean_name = name.replace('零基础学英语', '').replace('-星荣英语笔记', '').strip()
-        return clean_name if clean_name else name
+        # Fallback: strip extension and series prefix/suffix in one pass
+        clean_name = _STRIP_RE.sub('', pdf_filename).strip()
+        return clean_name if clean_name else pdf_filename.replace('.pdf', '')
     
     def generate_deck_file(self, deck: genanki.Deck, output_path: str) -> bool:
         """
         Generate .apkg file for the deck
         """
         try:
-            genanki.Package(deck).write_to_file(output_path)
+            _BufferedPackage(deck).write_to_file(output_path)
             return True
         except Exception as e:
             print(f"Error generating deck file {output_path}: {e}")
@@ -256,7 +331,7 @@ class XingrongAnkiGenerator:
             deck = self.create_unified_deck(pdf_cards, deck_name)
             
             # Generate .apkg file
-            genanki.Package(deck).write_to_file(output_path)
+            _BufferedPackage(deck).write_to_file(output_path)
             return True
         except Exception as e:
             print(f"Error generating unified deck file {output_path}: {e}")
@@ -274,7 +349,7 @@ class XingrongAnkiGenerator:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
             # Package all decks together
-            package = genanki.Package(all_decks)
+            package = _BufferedPackage(all_decks)
             package.write_to_file(output_path)
             
             print(f"✅ Generated big deck with subdecks: {output_path}")
@@ -293,6 +368,8 @@ def main():
     """Main function for generating Anki decks"""
     from pdf_parser import XingrongPDFParser
     
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     print("=== 星荣英语 Anki 大deck生成器 ===")
     print()
     
@@ -7,6 +7,7 @@ Converts PDF content to Anki decks with Chinese front and English back
 import os
 import sys
 import argparse
+import logging
 from typing import List
 from pdf_parser import XingrongPDFParser, VocabularyCard
 from anki_generator import XingrongAnkiGenerator
@@ -57,7 +58,7 @@ def process_unified_deck(pdf_dir: str = "pdf", output_dir: str = "anki_decks", d
     
     print(f"Processing all PDFs in {pdf_dir} for unified deck")
     
-    # Parse all PDFs
+    # Parse all PDFs (in parallel, one worker process per CPU core)
     parser = XingrongPDFParser()
     pdf_cards = parser.parse_all_pdfs(pdf_dir)
     
@@ -171,6 +172,8 @@ Examples:
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     # List PDFs if requested
     if args.list_pdfs:
         if os.path.exists(args.pdf_dir):
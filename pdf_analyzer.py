@@ -30,11 +30,11 @@ def analyze_pdf_structure(pdf_path: str) -> Dict[str, Any]:
             page = pdf.pages[i]
             text = page.extract_text()
             
+            # Only the text is reported, so skip extract_words()/extract_text_simple()
+            # which would each re-walk the page's character stream
             page_info = {
                 'page_number': i + 1,
-                'text': text,
-                'words': page.extract_words(),
-                'lines': page.extract_text_simple()
+                'text': text
             }
             
             analysis['page_contents'].append(page_info)
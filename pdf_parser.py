@@ -6,14 +6,69 @@ Extracts Chinese, English, and phonetic content from page 2 onwards
 
 import pdfplumber
 import camelot
-import pandas as pd
+import playa
+from playa.structure import Element
+try:
+    import pymupdf  # Optional: fast text extraction for the fallback path
+except ImportError:
+    pymupdf = None
+try:
+    import orjson  # Optional: faster JSON serialization for save_to_json
+except ImportError:
+    orjson = None
+import functools
+import gc
+import hashlib
+import itertools
+import logging
 import re
 import os
+import sys
 import json
-from typing import List, Dict, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
-@dataclass
+# Number of pages handed to Camelot per read_pdf call
+CAMELOT_PAGE_CHUNK = 10
+
+# Bump whenever parsing output changes so stale on-disk cache entries are ignored
+PARSE_CACHE_VERSION = 2
+
+# Precompiled patterns for text classification
+_NEWLINE_DELETE = str.maketrans('', '', '\r\n')
+_RE_CJK = re.compile(r'[\u4e00-\u9fff]')
+_RE_CJK_ONLY = re.compile(r'^[\u4e00-\u9fff；，。！？]+$')
+_RE_ALPHA = re.compile(r'[a-zA-Z]')
+
+# More specific header patterns to avoid filtering vocabulary lines
+# All entries are matched as literal substrings, the lesson title is a real regex
+_HEADER_LESSON_PATTERN = r'第[^\n]{0,5}课'  # 第X课
+_HEADER_PATTERNS = (
+    'lesson',
+    'page',
+    '星荣英语笔记',
+    '你好，我是星荣',
+    '微信：xingrong-english',
+    '公众号：Hi要大声说出来',
+    '祝好运！',
+    '中文 英文 K.K.音标',  # Table header
+    '这是零基础学英语系列',
+    '上一节课的内容',
+    '非常感谢大家的订阅',
+    '你们的支持是我更新的动力'
+)
+_HEADER_RE = re.compile('|'.join([_HEADER_LESSON_PATTERN] + [re.escape(pattern) for pattern in _HEADER_PATTERNS]))
+
+# Single-character phonetic indicators: slashes, brackets and IPA stress/length marks
+_PHONETIC_CHARS = frozenset(['/', '[', ']', 'ˈ', 'ˌ', 'ː'])
+
+# dataclass(slots=True) needs Python 3.10+, setup.py still allows 3.9
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+logger = logging.getLogger(__name__)
+
+@dataclass(**_DATACLASS_SLOTS)
 class VocabularyCard:
     """Represents a vocabulary card with Chinese, English, and phonetic"""
     chinese: str
@@ -30,30 +85,31 @@ class XingrongPDFParser:
     
     def __init__(self):
         self.cards: List[VocabularyCard] = []
-        self.use_camelot = True  # Use Camelot by default for better table extraction
+        self.use_camelot = True  # Use table extraction by default, text parsing is the fallback
+        # Table backend: 'playa' reads the tagged PDF structure tree (fast) and falls
+        # back to Camelot for untagged PDFs, 'camelot' always uses Camelot
+        self.backend = 'playa'
+        # Text fallback backend: 'pdfplumber' (default) or 'pymupdf' (much faster when
+        # installed, but its line layout yields fewer entries on the bundled lessons)
+        self.text_backend = 'pdfplumber'
+        # Directory for parsed results keyed by PDF content hash, None disables caching
+        self.cache_dir = '.cache'
         
     def clean_text(self, text: str) -> str:
         """
         Clean text by removing newlines and normalizing whitespace
         """
-        if not text or text == 'nan' or pd.isna(text):
-            return ''
-        
-        # Convert to string
-        text = str(text)
+        # Camelot cells are already str; only convert the odd non-str value
+        # (a NaN float becomes 'nan' and is dropped below)
+        if not isinstance(text, str):
+            text = '' if text is None else str(text)
         
-        # Remove various newline characters directly (no replacement)
-        text = text.replace('\n', '')
-        text = text.replace('\r', '')
-        text = text.replace('\r\n', '')
-        
-        # Replace multiple consecutive spaces with single space
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Strip leading and trailing whitespace
-        text = text.strip()
+        if not text or text == 'nan':
+            return ''
         
-        return text
+        # Remove newline characters directly (no replacement), then collapse
+        # whitespace runs to a single space and strip both ends in one pass
+        return ' '.join(text.translate(_NEWLINE_DELETE).split())
     
     def separate_chinese_english(self, mixed_text: str) -> tuple:
         """
@@ -69,15 +125,17 @@ class XingrongPDFParser:
         chinese_part = []
         english_part = []
         found_english = False
+        cjk_search = _RE_CJK.search
+        cjk_only_match = _RE_CJK_ONLY.match
         
         for word in words:
-            # Check if word contains Chinese characters
-            if re.search(r'[\u4e00-\u9fff]', word):
+            # Check if word contains Chinese characters (ASCII words never do)
+            if not word.isascii() and cjk_search(word):
                 if not found_english:  # Still in Chinese section
                     chinese_part.append(word)
                 else:  # English section has started, this might be mixed
                     # If word is purely Chinese, it might be a new Chinese phrase
-                    if re.match(r'^[\u4e00-\u9fff；，。！？]+$', word):
+                    if cjk_only_match(word):
                         chinese_part.append(word)
                     else:
                         english_part.append(word)
@@ -86,69 +144,111 @@ class XingrongPDFParser:
                 found_english = True
                 english_part.append(word)
         
-        chinese_result = ' '.join(chinese_part).strip()
-        english_result = ' '.join(english_part).strip()
+        # Words come from split(), so the joins never need stripping
+        chinese_result = ' '.join(chinese_part)
+        english_result = ' '.join(english_part)
         
         return chinese_result, english_result
     
     def extract_tables_from_pdf(self, pdf_path: str) -> List[VocabularyCard]:
         """
-        Extract vocabulary tables from PDF using Camelot
+        Extract vocabulary tables from PDF using the configured table backend
         """
-        print(f"Extracting tables from PDF using Camelot: {pdf_path}")
+        if self.backend == 'playa':
+            cards = self.extract_tables_from_pdf_playa(pdf_path)
+            if cards:
+                return cards
+            logger.info("No tagged tables found, falling back to Camelot...")
+        
+        return self.extract_tables_from_pdf_camelot(pdf_path)
+    
+    def extract_tables_from_pdf_playa(self, pdf_path: str) -> List[VocabularyCard]:
+        """
+        Extract vocabulary tables from the PDF structure tree using PLAYA
+        Only works for tagged PDFs; returns an empty list otherwise
+        """
+        logger.info("Extracting tables from PDF using PLAYA: %s", pdf_path)
         
         try:
-            # Try lattice method first (better for tables with borders)
-            tables = camelot.read_pdf(pdf_path, pages='2-end', flavor='lattice')
-            print(f"Lattice method found {len(tables)} tables")
+            tables = self._extract_tables_playa(pdf_path)
+        except Exception as e:
+            print(f"Error extracting tables with PLAYA: {e}")
+            return []
+        
+        logger.info("Structure tree contains %d tables", len(tables))
+        
+        all_cards = []
+        for table_idx, rows in enumerate(tables):
+            logger.debug("Processing table %d: %d rows", table_idx + 1, len(rows))
+            all_cards.extend(self._process_table_rows(table_idx, enumerate(rows), skip_headers=True))
+        
+        logger.info("Total vocabulary cards extracted: %d", len(all_cards))
+        return all_cards
+    
+    def _extract_tables_playa(self, pdf_path: str) -> List[List[List[str]]]:
+        """
+        Read Table/TR/TD elements from the structure tree
+        Returns one list of rows per table, each row being a list of cell texts
+        """
+        tables = []
+        with playa.open(pdf_path) as doc:
+            if doc.structure is None:
+                return tables
             
-            if len(tables) == 0:
-                # If no tables found, try stream method
-                tables = camelot.read_pdf(pdf_path, pages='2-end', flavor='stream')
-                print(f"Stream method found {len(tables)} tables")
+            for table in doc.structure.find_all('Table'):
+                # Like Camelot with pages='2-end', skip tables on the cover page
+                page = table.page
+                if page is not None and page.page_idx == 0:
+                    continue
+                
+                rows = []
+                for row in table.find_all('TR'):
+                    cells = [self._structure_text(cell) for cell in row if isinstance(cell, Element)]
+                    if len(cells) >= 2:  # Need at least Chinese and English columns
+                        rows.append(cells)
+                tables.append(rows)
+        
+        return tables
+    
+    def _structure_text(self, element: Element) -> str:
+        """Concatenate the text of all marked content below a structure element"""
+        parts = []
+        for child in element:
+            if isinstance(child, Element):
+                parts.append(self._structure_text(child))
+            else:
+                text = getattr(child, 'text', None)
+                if text:
+                    parts.append(text)
+        return ''.join(parts)
+    
+    def extract_tables_from_pdf_camelot(self, pdf_path: str) -> List[VocabularyCard]:
+        """
+        Extract vocabulary tables from PDF using Camelot
+        Pages are read in chunks so Camelot's page images are freed between chunks
+        """
+        logger.info("Extracting tables from PDF using Camelot: %s", pdf_path)
+        
+        try:
+            with playa.open(pdf_path) as doc:
+                page_count = len(doc.pages)
+                has_ruling = self._has_ruling_paths(doc)
             
-            all_cards = []
+            if has_ruling:
+                # Try lattice method first (better for tables with borders)
+                table_count, all_cards = self._extract_camelot_chunks(pdf_path, page_count, 'lattice')
+                logger.info("Lattice method found %d tables", table_count)
+            else:
+                # Lattice needs drawn ruling lines; without any it cannot find a table
+                logger.info("No ruling lines found, skipping lattice method")
+                table_count = 0
             
-            for table_idx, table in enumerate(tables):
-                df = table.df
-                print(f"Processing table {table_idx + 1}: shape {df.shape}, accuracy {table.accuracy:.2f}")
-                
-                for row_idx, row in df.iterrows():
-                    # Extract three columns: Chinese, English, Phonetic
-                    raw_chinese = self.clean_text(row.iloc[0])
-                    raw_english = self.clean_text(row.iloc[1])
-                    phonetic = self.clean_text(row.iloc[2]) if len(row) > 2 else ''
-                    
-                    # Handle mixed Chinese-English in the first column
-                    if raw_chinese and re.search(r'[a-zA-Z]', raw_chinese):
-                        # First column contains mixed Chinese and English
-                        chinese_part, english_part = self.separate_chinese_english(raw_chinese)
-                        
-                        # Combine with second column if it contains more English
-                        if raw_english and not re.search(r'[\u4e00-\u9fff]', raw_english):
-                            english = (english_part + ' ' + raw_english).strip()
-                        else:
-                            english = english_part
-                        
-                        chinese = chinese_part
-                    else:
-                        # Normal case: Chinese in first column, English in second
-                        chinese = raw_chinese
-                        english = raw_english
-                    
-                    # Validate entry
-                    if self.is_valid_vocabulary_entry(chinese, english):
-                        card = VocabularyCard(
-                            chinese=chinese,
-                            english=english,
-                            phonetic=phonetic if phonetic else None,
-                            table_index=table_idx + 1,
-                            row_index=row_idx
-                        )
-                        all_cards.append(card)
-                        print(f"Extracted: {chinese} → {english}")
+            if table_count == 0:
+                # If no tables found, try stream method
+                table_count, all_cards = self._extract_camelot_chunks(pdf_path, page_count, 'stream')
+                logger.info("Stream method found %d tables", table_count)
             
-            print(f"Total vocabulary cards extracted: {len(all_cards)}")
+            logger.info("Total vocabulary cards extracted: %d", len(all_cards))
             return all_cards
             
         except Exception as e:
@@ -156,6 +256,93 @@ class XingrongPDFParser:
             print("Falling back to text-based parsing...")
             return self.extract_text_from_pdf_fallback(pdf_path)
     
+    @staticmethod
+    def _has_ruling_paths(doc) -> bool:
+        """
+        Check whether any page after the first draws vector paths (lines or rectangles)
+        Table borders in these PDFs are drawn as thin filled rectangles, often not on page 2
+        """
+        for page_idx, page in enumerate(doc.pages):
+            if page_idx == 0:
+                continue
+            for _ in page.paths:
+                return True
+        return False
+    
+    def _extract_camelot_chunks(self, pdf_path: str, page_count: int, flavor: str) -> Tuple[int, List[VocabularyCard]]:
+        """
+        Run Camelot over pages 2..page_count, CAMELOT_PAGE_CHUNK pages at a time
+        Returns (number of tables found, vocabulary cards)
+        """
+        table_count = 0
+        cards = []
+        
+        for first_page in range(2, page_count + 1, CAMELOT_PAGE_CHUNK):
+            last_page = min(first_page + CAMELOT_PAGE_CHUNK - 1, page_count)
+            tables = camelot.read_pdf(pdf_path, pages=f"{first_page}-{last_page}", flavor=flavor)
+            
+            for table in tables:
+                logger.debug("Processing table %d: shape %s, accuracy %.2f", table_count + 1, table.shape, table.accuracy)
+                
+                # Cell texts straight from table.data, same values as table.df without pandas
+                rows = enumerate(table.data)
+                cards.extend(self._process_table_rows(table_count, rows))
+                table_count += 1
+            
+            # Release this chunk's tables and page images before reading the next one
+            del tables
+            gc.collect()
+        
+        return table_count, cards
+    
+    def _process_table_rows(self, table_idx: int, rows, skip_headers: bool = False) -> List[VocabularyCard]:
+        """
+        Turn (row_idx, cells) pairs of one table into vocabulary cards
+        Cells are expected in column order: Chinese, English, Phonetic
+        """
+        cards = []
+        
+        for row_idx, row in rows:
+            # Extract three columns: Chinese, English, Phonetic
+            raw_chinese = self.clean_text(row[0])
+            raw_english = self.clean_text(row[1])
+            phonetic = self.clean_text(row[2]) if len(row) > 2 else ''
+            
+            # Structure trees also tag page headers/footers as tables
+            if skip_headers and self._is_header_line(raw_chinese):
+                continue
+            
+            # Handle mixed Chinese-English in the first column
+            if raw_chinese and _RE_ALPHA.search(raw_chinese):
+                # First column contains mixed Chinese and English
+                chinese_part, english_part = self.separate_chinese_english(raw_chinese)
+                
+                # Combine with second column if it contains more English
+                if raw_english and not _RE_CJK.search(raw_english):
+                    english = (english_part + ' ' + raw_english).strip()
+                else:
+                    english = english_part
+                
+                chinese = chinese_part
+            else:
+                # Normal case: Chinese in first column, English in second
+                chinese = raw_chinese
+                english = raw_english
+            
+            # Validate entry
+            if self.is_valid_vocabulary_entry(chinese, english):
+                card = VocabularyCard(
+                    chinese=chinese,
+                    english=english,
+                    phonetic=phonetic if phonetic else None,
+                    table_index=table_idx + 1,
+                    row_index=row_idx
+                )
+                cards.append(card)
+                logger.debug("Extracted: %s → %s", chinese, english)
+        
+        return cards
+    
     def is_valid_vocabulary_entry(self, chinese: str, english: str) -> bool:
         """
         Check if the entry is a valid vocabulary entry
@@ -179,57 +366,99 @@ class XingrongPDFParser:
         """
         Fallback method: Extract text from PDF and parse using text-based approach
         """
+        if self.text_backend == 'pymupdf' and pymupdf is not None:
+            full_text = self._extract_text_pymupdf(pdf_path, start_page)
+            if full_text is not None:
+                return self.parse_vocabulary_content(full_text)
+        
         try:
             with pdfplumber.open(pdf_path) as pdf:
                 if len(pdf.pages) <= start_page:
                     print(f"PDF has only {len(pdf.pages)} pages, cannot start from page {start_page + 1}")
                     return []
                 
-                # Extract text from pages starting from start_page (0-indexed)
-                full_text = ""
-                for i in range(start_page, len(pdf.pages)):
-                    page = pdf.pages[i]
-                    text = page.extract_text()
-                    if text:
-                        full_text += text + "\n"
+                # Stream lines page by page (start_page is 0-indexed) instead of
+                # building the whole document text first
+                lines = (line
+                         for text in self._iter_page_texts(pdf, start_page)
+                         for line in text.splitlines())
                 
                 # Parse vocabulary content using the old text-based method
-                return self.parse_vocabulary_content(full_text)
+                return self.parse_vocabulary_lines(lines)
                 
         except Exception as e:
             print(f"Error reading PDF {pdf_path}: {e}")
             return []
     
+    @staticmethod
+    def _iter_page_texts(pdf, start_page: int):
+        """
+        Yield the non-empty text of each pdfplumber page from start_page (0-indexed) on
+        """
+        for i in range(start_page, len(pdf.pages)):
+            page = pdf.pages[i]
+            text = page.extract_text()
+            # Drop the page's parsed layout objects; pdf.pages keeps every page alive
+            page.flush_cache()
+            if text:
+                yield text
+    
+    def _extract_text_pymupdf(self, pdf_path: str, start_page: int) -> Optional[str]:
+        """
+        Extract text from pages starting from start_page (0-indexed) with PyMuPDF
+        Returns None if PyMuPDF cannot read the file, so pdfplumber can be tried instead
+        """
+        try:
+            with pymupdf.open(pdf_path) as doc:
+                if doc.page_count <= start_page:
+                    print(f"PDF has only {doc.page_count} pages, cannot start from page {start_page + 1}")
+                    return ""
+                return "\n".join(doc[i].get_text() for i in range(start_page, doc.page_count))
+        except Exception as e:
+            print(f"Error reading PDF {pdf_path} with PyMuPDF: {e}")
+            print("Retrying with pdfplumber...")
+            return None
+    
     def parse_vocabulary_content(self, text: str) -> List[VocabularyCard]:
         """
         Parse vocabulary content from text
         Look for patterns of Chinese, English, and phonetic text
         Handle long sentences that are split across multiple lines
         """
+        return self.parse_vocabulary_lines(text.splitlines())
+    
+    def parse_vocabulary_lines(self, lines: Iterable[str]) -> List[VocabularyCard]:
+        """
+        Parse vocabulary content from an iterable of raw text lines
+        Only the stripped, non-empty lines are kept for the lookahead passes
+        """
         cards = []
-        lines = text.split('\n')
         
-        # Remove empty lines and clean up
-        lines = [line.strip() for line in lines if line.strip()]
+        # Remove empty lines and clean up, stripping each line once
+        lines = [line for line in map(str.strip, lines) if line]
         
         # First, merge split lines to handle long sentences
         lines = self._merge_split_lines(lines)
         
+        # Classify every line once; the lookahead below revisits lines several times
+        flags = self._classify_lines(lines)
+        
         i = 0
         
         while i < len(lines):
             line = lines[i]
+            has_chinese, has_english, _, is_header = flags[i]
             
             # Skip headers and non-vocabulary content
-            if self._is_header_line(line):
+            if is_header:
                 i += 1
                 continue
             
             # Look for Chinese text (contains Chinese characters)
-            if self._contains_chinese(line):
+            if has_chinese:
                 # Try to parse the line as a complete vocabulary entry
                 # Format: "中文 英文 /音标/" or "中文 英文"
-                if self._contains_english(line):
+                if has_english:
                     chinese, english, phonetic = self._parse_single_line_vocabulary(line)
                     if chinese and english:
                         card = VocabularyCard(
@@ -238,34 +467,38 @@ class XingrongPDFParser:
                             phonetic=phonetic if phonetic else None
                         )
                         cards.append(card)
-                        print(f"Found vocabulary card: {card}")
+                        logger.debug("Found vocabulary card: %s", card)
                         i += 1
                         continue
                 
                 # If single line parsing didn't work, try multi-line format
-                chinese = line.strip()
+                # Lines were stripped when the text was split above
+                chinese = line
                 english = ""
                 phonetic = ""
+                english_idx = i
                 
                 # Check next few lines for English and phonetic
                 for j in range(i + 1, min(i + 5, len(lines))):
                     next_line = lines[j]
+                    next_chinese, next_english, next_phonetic, next_header = flags[j]
                     
                     # Skip header lines
-                    if self._is_header_line(next_line):
+                    if next_header:
                         continue
                     
                     # If we hit another Chinese line, stop
-                    if self._contains_chinese(next_line) and not english:
+                    if next_chinese and not english:
                         break
                     
                     # Check if line contains English (Latin characters)
-                    if self._contains_english(next_line) and not english:
-                        english = next_line.strip()
+                    if next_english and not english:
+                        english = next_line
+                        english_idx = j
                     
                     # Check if line contains phonetic symbols (brackets or slashes)
-                    elif self._contains_phonetic(next_line):
-                        phonetic = next_line.strip()
+                    elif next_phonetic:
+                        phonetic = next_line
                 
                 if chinese and english:
                     card = VocabularyCard(
@@ -274,10 +507,12 @@ class XingrongPDFParser:
                         phonetic=phonetic if phonetic else None
                     )
                     cards.append(card)
-                    print(f"Found multi-line card: {card}")
+                    logger.debug("Found multi-line card: %s", card)
                 
-                # Move to next potential vocabulary item
-                i += 1
+                # Move to next potential vocabulary item. Lines up to the English
+                # line hold no Chinese (the lookahead stops at one), so they can be
+                # skipped; later lines may still start a card and are rescanned
+                i = english_idx + 1
             else:
                 i += 1
         
@@ -289,40 +524,43 @@ class XingrongPDFParser:
         Handle cases where long sentences are broken across multiple lines
         """
         merged_lines = []
+        flags = self._classify_lines(lines)
         i = 0
         
         while i < len(lines):
             current_line = lines[i]
+            has_chinese, has_english, _, is_header = flags[i]
             
             # Skip header lines
-            if self._is_header_line(current_line):
+            if is_header:
                 merged_lines.append(current_line)
                 i += 1
                 continue
             
             # Try to detect multi-line vocabulary entries
-            merged_entry = self._try_merge_multiline_entry(lines, i)
+            merged_entry = self._try_merge_multiline_entry(lines, i, flags)
             if merged_entry:
                 merged_lines.append(merged_entry['merged_line'])
-                print(f"Merged multi-line entry: {merged_entry['lines_used']} lines -> '{merged_entry['merged_line'][:100]}...'")
+                logger.debug("Merged multi-line entry: %d lines -> '%.100s...'", merged_entry['lines_used'], merged_entry['merged_line'])
                 i += merged_entry['lines_used']
                 continue
             
             # Check if this line contains Chinese and English but might be incomplete
-            if self._contains_chinese(current_line) and self._contains_english(current_line):
+            if has_chinese and has_english:
                 # Look at the next line to see if it's a continuation
                 if i + 1 < len(lines):
                     next_line = lines[i + 1]
+                    next_chinese, next_english, next_phonetic, next_header = flags[i + 1]
                     
                     # Check if next line is a continuation (no Chinese, has English/phonetic)
-                    if (not self._contains_chinese(next_line) and 
-                        (self._contains_english(next_line) or self._contains_phonetic(next_line)) and
-                        not self._is_header_line(next_line)):
+                    if (not next_chinese and 
+                        (next_english or next_phonetic) and
+                        not next_header):
                         
                         # Merge the lines
                         merged_line = current_line + " " + next_line
                         merged_lines.append(merged_line)
-                        print(f"Merged split line: '{current_line}' + '{next_line}' -> '{merged_line}'")
+                        logger.debug("Merged split line: '%s' + '%s' -> '%s'", current_line, next_line, merged_line)
                         i += 2  # Skip both lines
                         continue
                 
@@ -336,7 +574,8 @@ class XingrongPDFParser:
         
         return merged_lines
     
-    def _try_merge_multiline_entry(self, lines: List[str], start_idx: int) -> Optional[Dict]:
+    def _try_merge_multiline_entry(self, lines: List[str], start_idx: int,
+                                   flags: Optional[List[Tuple[bool, bool, bool, bool]]] = None) -> Optional[Dict]:
         """
         Try to merge a multi-line vocabulary entry where Chinese, English, and phonetic
         are each split across multiple lines
@@ -351,6 +590,9 @@ class XingrongPDFParser:
         """
         if start_idx >= len(lines):
             return None
+        
+        if flags is None:
+            flags = self._classify_lines(lines)
             
         # Look ahead to see if we have a pattern of split Chinese/English/Phonetic
         chinese_lines = []
@@ -363,9 +605,10 @@ class XingrongPDFParser:
         # Phase 1: Collect Chinese lines (lines that contain Chinese but may be incomplete)
         while i < start_idx + max_look_ahead:
             line = lines[i].strip()
-            if not line or self._is_header_line(line):
+            has_chinese, has_english, has_phonetic, is_header = flags[i]
+            if not line or is_header:
                 break
-            if self._contains_chinese(line) and not self._contains_phonetic(line):
+            if has_chinese and not has_phonetic:
                 chinese_lines.append(line)
                 i += 1
             else:
@@ -374,11 +617,12 @@ class XingrongPDFParser:
         # Phase 2: Collect English lines (lines that contain English but no Chinese)
         while i < start_idx + max_look_ahead:
             line = lines[i].strip()
-            if not line or self._is_header_line(line):
+            has_chinese, has_english, has_phonetic, is_header = flags[i]
+            if not line or is_header:
                 break
-            if (self._contains_english(line) and 
-                not self._contains_chinese(line) and 
-                not self._contains_phonetic(line)):
+            if (has_english and 
+                not has_chinese and 
+                not has_phonetic):
                 english_lines.append(line)
                 i += 1
             else:
@@ -387,9 +631,10 @@ class XingrongPDFParser:
         # Phase 3: Collect phonetic lines (lines that contain phonetic symbols)
         while i < start_idx + max_look_ahead:
             line = lines[i].strip()
-            if not line or self._is_header_line(line):
+            has_chinese, has_english, has_phonetic, is_header = flags[i]
+            if not line or is_header:
                 break
-            if self._contains_phonetic(line) and not self._contains_chinese(line):
+            if has_phonetic and not has_chinese:
                 phonetic_lines.append(line)
                 i += 1
             else:
@@ -421,104 +666,156 @@ class XingrongPDFParser:
         Format: "中文 英文 /音标/" or "中文 英文"
         """
         try:
-            # Split by spaces and extract components
-            parts = line.split()
-            
             chinese_parts = []
             english_parts = []
             phonetic_parts = []
+            # Bind the hot calls once; this runs for every candidate line
+            cjk_search = _RE_CJK.search
+            no_phonetic = _PHONETIC_CHARS.isdisjoint
             
-            for part in parts:
-                # Check if part contains Chinese characters
-                if self._contains_chinese(part):
+            # Split by spaces and sort each part into one bucket
+            for part in line.split():
+                # Check if part contains Chinese characters (ASCII parts never do)
+                if not part.isascii() and cjk_search(part):
                     chinese_parts.append(part)
                 # Check if part contains phonetic symbols
-                elif self._contains_phonetic(part):
+                elif not no_phonetic(part):
                     phonetic_parts.append(part)
                 # Otherwise, treat as English
                 else:
                     english_parts.append(part)
             
-            chinese = ' '.join(chinese_parts) if chinese_parts else ""
-            english = ' '.join(english_parts) if english_parts else ""
-            phonetic = ' '.join(phonetic_parts) if phonetic_parts else ""
-            
-            return chinese, english, phonetic
+            return ' '.join(chinese_parts), ' '.join(english_parts), ' '.join(phonetic_parts)
             
         except Exception as e:
             print(f"Error parsing single line vocabulary '{line}': {e}")
             return "", "", ""
     
-    def _is_header_line(self, line: str) -> bool:
+    def _classify_lines(self, lines: List[str]) -> List[Tuple[bool, bool, bool, bool]]:
+        """
+        Classify each line once
+        Returns (contains_chinese, contains_english, contains_phonetic, is_header) per line
+        """
+        return [(self._contains_chinese(line), self._contains_english(line),
+                 self._contains_phonetic(line), self._is_header_line(line))
+                for line in lines]
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _is_header_line(line: str) -> bool:
         """Check if line is a header or non-vocabulary content"""
-        # More specific header patterns to avoid filtering vocabulary lines
-        header_patterns = [
-            '第.*课',  # 第X课
-            'lesson', 
-            'page',
-            '星荣英语笔记',
-            '你好，我是星荣',
-            '微信：xingrong-english',
-            '公众号：Hi要大声说出来',
-            '祝好运！',
-            '中文 英文 K.K.音标',  # Table header
-            '这是零基础学英语系列',
-            '上一节课的内容',
-            '非常感谢大家的订阅',
-            '你们的支持是我更新的动力'
-        ]
-        
-        # Check for header patterns
-        for pattern in header_patterns:
-            if pattern in line:
-                return True
+        # Cheap checks first, the pattern scan only runs for the remaining lines
+        line_length = len(line)
         
         # Skip lines that are too long (likely paragraphs)
-        if len(line) > 100:
+        if line_length > 100:
             return True
+        
+        if line_length == 0:
+            return False
             
-        # Skip lines that are just numbers
-        if line.strip().isdigit():
+        # Skip lines that are just (ASCII) page numbers; isascii() is a flag read
+        # and rules out the Chinese lines before the per-character isdigit() walk
+        stripped = line.strip()
+        if stripped.isascii() and stripped.isdigit():
             return True
-            
-        return False
+        
+        # Check for header patterns (one scan for all of them)
+        return _HEADER_RE.search(line) is not None
     
     def _contains_chinese(self, text: str) -> bool:
         """Check if text contains Chinese characters"""
-        chinese_pattern = re.compile(r'[\u4e00-\u9fff]')
-        return bool(chinese_pattern.search(text))
+        return _RE_CJK.search(text) is not None
     
     def _contains_english(self, text: str) -> bool:
         """Check if text contains English characters"""
-        english_pattern = re.compile(r'[a-zA-Z]')
-        return bool(english_pattern.search(text))
+        return _RE_ALPHA.search(text) is not None
     
     def _contains_phonetic(self, text: str) -> bool:
         """Check if text contains phonetic symbols"""
-        phonetic_indicators = ['/', '[', ']', 'ˈ', 'ˌ', 'ː']
-        return any(indicator in text for indicator in phonetic_indicators)
+        return not _PHONETIC_CHARS.isdisjoint(text)
     
     def parse_pdf(self, pdf_path: str) -> List[VocabularyCard]:
         """
         Parse a single PDF file and extract vocabulary cards
-        Uses Camelot for table extraction by default, falls back to text parsing if needed
+        Uses table extraction (PLAYA, then Camelot) by default, falls back to text parsing if needed
         """
-        print(f"Parsing PDF: {pdf_path}")
+        logger.info("Parsing PDF: %s", pdf_path)
         
+        cache_path = None
+        if self.cache_dir:
+            try:
+                cache_path = self._cache_path(pdf_path)
+            except OSError as e:
+                # Unreadable input: skip the cache and let extraction report the error
+                print(f"Could not hash {pdf_path} for caching: {e}")
+        if cache_path:
+            cards = self._load_cached_cards(cache_path)
+            if cards is not None:
+                logger.info("Loaded %d vocabulary cards from cache: %s", len(cards), cache_path)
+                return cards
+        
+        cards = self._parse_pdf_uncached(pdf_path)
+        if cache_path and cards:
+            self._store_cached_cards(cache_path, cards)
+        return cards
+    
+    def _parse_pdf_uncached(self, pdf_path: str) -> List[VocabularyCard]:
+        """
+        Run table extraction and the text fallback without consulting the cache
+        """
         if self.use_camelot:
-            # Try Camelot table extraction first
+            # Try table extraction first
             cards = self.extract_tables_from_pdf(pdf_path)
             if cards:
-                print(f"Successfully extracted {len(cards)} vocabulary cards using Camelot")
+                logger.info("Successfully extracted %d vocabulary cards using table extraction", len(cards))
                 return cards
             else:
-                print("Camelot extraction failed, falling back to text-based parsing...")
+                logger.info("Table extraction failed, falling back to text-based parsing...")
         
         # Fallback to text-based parsing
         cards = self.extract_text_from_pdf_fallback(pdf_path, start_page=1)
-        print(f"Extracted {len(cards)} vocabulary cards using text-based parsing")
+        logger.info("Extracted %d vocabulary cards using text-based parsing", len(cards))
         return cards
     
+    def _cache_path(self, pdf_path: str) -> str:
+        """
+        Cache file for a PDF, keyed by its content and the parser settings that affect output
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{PARSE_CACHE_VERSION}:{self.use_camelot}:{self.backend}:{self.text_backend}:".encode())
+        with open(pdf_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}.json")
+    
+    @staticmethod
+    def _load_cached_cards(cache_path: str) -> Optional[List[VocabularyCard]]:
+        """
+        Read cached cards, returns None when there is no usable cache entry
+        """
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                rows = json.load(f)
+            return [VocabularyCard(*row) for row in rows]
+        except (OSError, ValueError, TypeError):
+            return None
+    
+    @staticmethod
+    def _store_cached_cards(cache_path: str, cards: List[VocabularyCard]):
+        """
+        Write cards to the cache, via a temp file so concurrent workers never see partial JSON
+        """
+        rows = [[card.chinese, card.english, card.phonetic, card.table_index, card.row_index] for card in cards]
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(rows, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Could not write cache {cache_path}: {e}")
+    
     def parse_all_pdfs(self, pdf_directory: str) -> Dict[str, List[VocabularyCard]]:
         """
         Parse all PDF files in a directory
@@ -530,25 +827,48 @@ class XingrongPDFParser:
             print(f"Directory {pdf_directory} does not exist")
             return results
         
-        pdf_files = [f for f in os.listdir(pdf_directory) if f.endswith('.pdf')]
+        # DirEntry carries the file type from the directory read; sizes are read for scheduling
+        with os.scandir(pdf_directory) as entries:
+            pdf_sizes = {entry.name: entry.stat().st_size for entry in entries
+                         if entry.name.endswith('.pdf') and entry.is_file()}
+        pdf_files = sorted(pdf_sizes)
         
         if not pdf_files:
             print(f"No PDF files found in {pdf_directory}")
             return results
         
-        print(f"Found {len(pdf_files)} PDF files")
+        logger.info("Found %d PDF files", len(pdf_files))
         
-        for pdf_file in sorted(pdf_files):
-            pdf_path = os.path.join(pdf_directory, pdf_file)
-            try:
-                cards = self.parse_pdf(pdf_path)
-                results[pdf_file] = cards
-            except Exception as e:
-                print(f"Error parsing {pdf_file}: {e}")
-                results[pdf_file] = []
+        # Each PDF is independent and parsing is CPU-bound, so use processes.
+        # Largest files are submitted first so none of them starts last and straggles
+        schedule = sorted(pdf_files, key=pdf_sizes.get, reverse=True)
+        pdf_paths = [os.path.join(pdf_directory, pdf_file) for pdf_file in schedule]
+        # Spawned workers (macOS/Windows) start with unconfigured logging, so set it up there
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=_init_worker_logging,
+                                 initargs=(logging.getLogger().getEffectiveLevel(),)) as executor:
+            parsed = dict(zip(schedule, executor.map(_parse_one, itertools.repeat(self), pdf_paths, chunksize=1)))
+        
+        # Lessons repeat many words, so unpickled duplicates share one string object
+        str_pool = {}
+        for pdf_file in pdf_files:
+            cards = parsed[pdf_file]
+            self._share_strings(cards, str_pool)
+            results[pdf_file] = cards
         
         return results
     
+    @staticmethod
+    def _share_strings(cards: List[VocabularyCard], str_pool: Dict[str, str]):
+        """
+        Replace card strings with the first equal string seen in str_pool
+        """
+        share = str_pool.setdefault
+        for card in cards:
+            card.chinese = share(card.chinese, card.chinese)
+            card.english = share(card.english, card.english)
+            if card.phonetic:
+                card.phonetic = share(card.phonetic, card.phonetic)
+    
     def save_to_json(self, cards: List[VocabularyCard], output_file: str):
         """
         Save vocabulary cards to JSON file
@@ -563,8 +883,12 @@ class XingrongPDFParser:
                 'row_index': card.row_index
             })
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
         
         print(f"Results saved to: {output_file}")
     
@@ -572,24 +896,43 @@ class XingrongPDFParser:
         """
         Save vocabulary cards to text file
         """
+        # Build the whole report in memory and write it in one call
+        parts = [f"Xingrong PDF Parser Results\nTotal cards: {len(cards)}\n{'=' * 60}\n\n"]
+        
+        for i, card in enumerate(cards, 1):
+            parts.append(f"{i:3d}. Chinese: {card.chinese}\n     English: {card.english}\n")
+            if card.phonetic:
+                parts.append(f"     Phonetic: {card.phonetic}\n")
+            if card.table_index:
+                parts.append(f"     Source: Table {card.table_index}, Row {card.row_index}\n")
+            parts.append("\n")
+        
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"Xingrong PDF Parser Results\n")
-            f.write(f"Total cards: {len(cards)}\n")
-            f.write("=" * 60 + "\n\n")
-            
-            for i, card in enumerate(cards, 1):
-                f.write(f"{i:3d}. Chinese: {card.chinese}\n")
-                f.write(f"     English: {card.english}\n")
-                if card.phonetic:
-                    f.write(f"     Phonetic: {card.phonetic}\n")
-                if card.table_index:
-                    f.write(f"     Source: Table {card.table_index}, Row {card.row_index}\n")
-                f.write("\n")
+            f.write(''.join(parts))
         
         print(f"Results saved to: {output_file}")
 
+def _init_worker_logging(level: int):
+    """
+    Configure logging in a worker process to match the parent's level
+    No-op when the worker already has handlers (inherited under fork)
+    """
+    logging.basicConfig(level=level, format='%(message)s')
+
+def _parse_one(parser: XingrongPDFParser, pdf_path: str) -> List[VocabularyCard]:
+    """
+    Parse a single PDF in a worker process with a copy of the caller's parser settings
+    Must stay a top-level function so ProcessPoolExecutor can pickle it
+    """
+    try:
+        return parser.parse_pdf(pdf_path)
+    except Exception as e:
+        print(f"Error parsing {os.path.basename(pdf_path)}: {e}")
+        return []
+
 def main():
     """Main function for testing the parser"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     parser = XingrongPDFParser()
     
     # Test with lesson 10.5 specifically
@@ -599,7 +942,7 @@ def main():
         print(f"PDF file not found: {pdf_path}")
         return
     
-    print("Testing enhanced PDF parser with Camelot integration...")
+    print("Testing enhanced PDF parser with table extraction...")
     cards = parser.parse_pdf(pdf_path)
     
     if cards:
@@ -615,9 +958,9 @@ def main():
         print(f"Long sentences (>20 chars): {len(long_sentences)}")
         
         # Show method used
-        camelot_cards = [card for card in cards if card.table_index is not None]
+        table_cards = [card for card in cards if card.table_index is not None]
         text_cards = [card for card in cards if card.table_index is None]
-        print(f"Camelot extracted: {len(camelot_cards)}")
+        print(f"Table extracted: {len(table_cards)}")
         print(f"Text-based extracted: {len(text_cards)}")
         
         # Show some examples